@@ -1,6 +1,7 @@
 """Application configuration using pydantic-settings."""
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -22,15 +23,27 @@ class AppSettings(BaseSettings):
     persist_uploads: bool = Field(
         default=False, description="Whether to keep uploaded files instead of deleting them."
     )
+    inline_parse_threshold_bytes: int = Field(
+        default=10 * 1024 * 1024,
+        description="Uploads at or below this size are parsed from memory without a temp file.",
+    )
     tessdata_prefix: Optional[str] = Field(
         default=None, description="Optional override for Tesseract language data directory."
     )
     ocr_languages: str = Field(default="eng", description="Languages to use for OCR.")
     llm_provider: Optional[str] = Field(default=None, description="LLM provider identifier.")
+    llm_providers: List[str] = Field(
+        default_factory=list,
+        description="Ordered LLM provider fallback chain; overrides llm_provider when set.",
+    )
     llm_api_key: Optional[str] = Field(default=None, description="LLM provider API key.")
     llm_model: Optional[str] = Field(default=None, description="Preferred chat model for LLM explanations.")
     llm_temperature: float = Field(default=0.2, description="Sampling temperature for LLM completions.")
     llm_max_tokens: int = Field(default=350, description="Max tokens returned from the LLM explainer.")
+    llm_service_tier: Optional[str] = Field(
+        default=None,
+        description="Optional latency/performance tier forwarded to the LLM provider.",
+    )
     report_footer_disclaimer: str = Field(
         default="Educational summary, not medical or legal advice.",
         description="Disclaimer text for generated reports.",
@@ -90,6 +103,7 @@ class AppSettings(BaseSettings):
         return path
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> AppSettings:
     """Return a cached instance of the application settings."""
     return AppSettings()
@@ -1,17 +1,121 @@
 """Language generation helpers for line item explanations."""
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import sys
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Callable, Dict, Final, List, Optional, Sequence, Tuple
 
 from app.config import AppSettings
 from app.models import Adjustment, PatientResponsibility
 
+try:  # pragma: no cover - optional dependency
+    import orjson
+except Exception:  # pragma: no cover - fallback when not installed
+    orjson = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - fallback when not installed
+    np = None  # type: ignore
+
+if np is not None:
+
+    def _adjustment_totals(amounts, line_idx, n_lines):
+        """Sum adjustment amounts into per-line totals; purely numeric so it can be JITed."""
+        totals = np.zeros(n_lines, dtype=np.float64)
+        for i in range(amounts.shape[0]):
+            totals[line_idx[i]] += amounts[i]
+        return totals
+
+    try:  # pragma: no cover - optional dependency
+        from numba import njit
+
+        _adjustment_totals = njit(cache=True)(_adjustment_totals)
+    except Exception:  # pragma: no cover - numba not installed
+        pass
+
 LOGGER = logging.getLogger(__name__)
 
+#: Precompiled money formatter; avoids re-parsing the format spec per call.
+_FMT_MONEY = "{}{:,.2f}".format
+
+#: Sentinel metadata entry; loader guarantees both keys on every real entry.
+_EMPTY_METADATA = {"description": "", "necessity": ""}
+
+_SYSTEM_PROMPT: Final[str] = sys.intern(
+    "You are a medical billing expert. Explain each service clearly "
+    "and justify why the patient might receive this bill. Use only "
+    "the numbers provided."
+)
+
+#: Static prompt skeleton compiled once; only the per-line fields are spliced in.
+_PROMPT_TEMPLATE = (
+    "Explain the following medical billing line item in two sentences. "
+    "Clarify what the service is, why it was medically necessary, and how the "
+    "math results in the patient responsibility. "
+    "Line number: {line_no}. Description: {description}. "
+    "Code: {code} ({code_type}). Date: {date}. "
+    "Charge: {charge}. "
+    "Allowed: {allowed} if available. "
+    "Insurance paid: {payer_paid} if available. "
+    "Adjustments: {adjustments}. "
+    "Patient components: {components}, total {patient_total}."
+)
+
+#: Default chat model; the narrow explanation task works well on the small tier.
+_DEFAULT_LLM_MODEL = "gpt-4o-mini"
+
+#: Batch polling cadence and ceiling; a stuck batch degrades to the fallback.
+_BATCH_POLL_INTERVAL = 5.0
+_BATCH_POLL_TIMEOUT = 15 * 60.0
+
+#: Few-shot examples anchoring tone and structure for smaller models.
+_FEW_SHOT_MESSAGES = [
+    {
+        "role": "user",
+        "content": (
+            "Explain the following medical billing line item in two sentences. "
+            "Line number: 1. Description: Office visit, established patient. "
+            "Code: 99213 (CPT). Date: 2024-01-05. Charge: $150.00. Allowed: $95.00. "
+            "Insurance paid: $76.00. Adjustments: contractual $-55.00. "
+            "Patient components: copay $19.00, total $19.00."
+        ),
+    },
+    {
+        "role": "assistant",
+        "content": (
+            "This line covers a routine office visit with your regular provider, billed "
+            "under code 99213. The plan's contracted rate lowered the $150.00 charge to "
+            "$95.00 and insurance paid $76.00, leaving your $19.00 copay as the patient "
+            "responsibility."
+        ),
+    },
+    {
+        "role": "user",
+        "content": (
+            "Explain the following medical billing line item in two sentences. "
+            "Line number: 2. Description: Dressing supplies. Code: unknown (UNKNOWN). "
+            "Date: n/a. Charge: $42.00. Adjustments: none. "
+            "Patient components: not provided, total $42.00."
+        ),
+    },
+    {
+        "role": "assistant",
+        "content": (
+            "This line is for dressing supplies used during your care; no insurer "
+            "pricing was reported for it. Because no insurance payment or adjustment "
+            "applies, the full $42.00 charge is the patient responsibility."
+        ),
+    },
+]
+
 
 @dataclass
 class ExplanationContext:
@@ -31,6 +135,10 @@ class ExplanationContext:
     units: Optional[float]
     provider: Optional[str]
     payer: Optional[str]
+    #: Lazily rendered patient-component sentence, shared between explainer paths.
+    components_text: Optional[str] = None
+    #: Precomputed sum of adjustment amounts, set by the parser to avoid re-iteration.
+    total_adjustment: Optional[float] = None
 
 
 class BaseExplainer:
@@ -42,17 +150,37 @@ class BaseExplainer:
     def explain(self, context: ExplanationContext) -> Tuple[str, float, List[str]]:
         raise NotImplementedError
 
+    def explain_many(self, contexts: Sequence[ExplanationContext]) -> List[Tuple[str, float, List[str]]]:
+        """Explain several contexts; subclasses may batch more efficiently."""
+        return [self.explain(context) for context in contexts]
+
 
 def _load_code_metadata(settings: AppSettings) -> Dict[str, Dict[str, str]]:
     """Load configurable metadata for known procedure codes."""
 
     path: Path = settings.code_dictionary_path
     try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        LOGGER.debug("Code dictionary file missing at %s", path)
+        return {}
+    return _parse_code_metadata(str(path.resolve()), mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _parse_code_metadata(path_str: str, mtime_ns: int) -> Dict[str, Dict[str, str]]:
+    """Parse the code dictionary, memoized on path and modification time."""
+
+    path = Path(path_str)
+    try:
+        if orjson is not None:
+            raw = orjson.loads(path.read_bytes())
+        else:
+            raw = json.loads(path.read_text(encoding="utf-8"))
     except FileNotFoundError:
         LOGGER.debug("Code dictionary file missing at %s", path)
         return {}
-    except json.JSONDecodeError as exc:  # pragma: no cover - config error path
+    except ValueError as exc:  # pragma: no cover - config error path
         LOGGER.warning("Failed to decode code dictionary %s: %s", path, exc)
         return {}
 
@@ -74,41 +202,56 @@ def _load_code_metadata(settings: AppSettings) -> Dict[str, Dict[str, str]]:
 class DeterministicExplainer(BaseExplainer):
     """Rule-based explanation engine that never invents numbers."""
 
-    def __init__(self, settings: AppSettings) -> None:
-        super().__init__(settings)
-        self._metadata = _load_code_metadata(settings)
+    @cached_property
+    def _metadata(self) -> Dict[str, Dict[str, str]]:
+        return _load_code_metadata(self.settings)
 
-    def explain(self, context: ExplanationContext) -> Tuple[str, float, List[str]]:
+    def explain(
+        self,
+        context: ExplanationContext,
+        total_adjustment: Optional[float] = None,
+    ) -> Tuple[str, float, List[str]]:
+        currency = self.settings.output_currency
         description = context.description
-        metadata = self._metadata.get(context.code or "", {})
-        friendly = metadata.get("description") or description
-        necessity = metadata.get("necessity") or self._fallback_necessity(context)
+        entry = self._metadata.get(context.code or "") or _EMPTY_METADATA
+        friendly = entry["description"] or description
+        necessity = entry["necessity"] or _fallback_necessity(context.code, context.provider)
 
         adjustment_text = ""
         if context.adjustments:
-            total_adj = sum(adj.amount for adj in context.adjustments)
-            sign = "reduction" if total_adj < 0 else "increase"
+            if total_adjustment is None:
+                total_adjustment = context.total_adjustment
+            if total_adjustment is not None:
+                total_adj = total_adjustment
+            else:
+                total_adj = 0.0
+                for adj in context.adjustments:
+                    total_adj += adj.amount
+            if total_adj < 0.0:
+                sign, magnitude = "reduction", -total_adj
+            else:
+                sign, magnitude = "increase", total_adj
             adjustment_text = (
-                f" Contractual {sign} of {self.settings.output_currency}{abs(total_adj):,.2f} "
+                f" Contractual {sign} of {_FMT_MONEY(currency, magnitude)} "
                 "was applied."
             )
 
         allowed_text = (
-            f" Allowed amount is {self.settings.output_currency}{context.allowed:,.2f}."
+            f" Allowed amount is {_FMT_MONEY(currency, context.allowed)}."
             if context.allowed is not None
             else ""
         )
         payer_text = (
-            f" Insurance paid {self.settings.output_currency}{context.payer_paid:,.2f}."
+            f" Insurance paid {_FMT_MONEY(currency, context.payer_paid)}."
             if context.payer_paid is not None
             else ""
         )
 
-        components = _describe_patient_components(context.patient_resp, self.settings.output_currency)
+        components = _components_for(context, currency)
         component_sentence = (
-            f" Patient responsibility comes from {components} for a total of {self.settings.output_currency}{context.patient_total:,.2f}."
+            f" Patient responsibility comes from {components} for a total of {_FMT_MONEY(currency, context.patient_total)}."
             if components
-            else f" Patient owes {self.settings.output_currency}{context.patient_total:,.2f}."
+            else f" Patient owes {_FMT_MONEY(currency, context.patient_total)}."
         )
 
         unit_text = ""
@@ -117,112 +260,254 @@ class DeterministicExplainer(BaseExplainer):
 
         dos_text = f" on {context.date_of_service}" if context.date_of_service else ""
 
-        narrative = (
-            f"Line {context.line_no}{dos_text}: {friendly}. {necessity} "
-            f"Provider billed {self.settings.output_currency}{context.charge:,.2f}.{unit_text}"
-            f"{adjustment_text}{allowed_text}{payer_text}{component_sentence}"
+        narrative = "".join(
+            [
+                f"Line {context.line_no}{dos_text}: {friendly}. {necessity} ",
+                f"Provider billed {_FMT_MONEY(currency, context.charge)}.{unit_text}",
+                adjustment_text,
+                allowed_text,
+                payer_text,
+                component_sentence,
+            ]
         ).strip()
 
-        confidence = 0.75
-        if not components:
-            confidence -= 0.1
-        if context.allowed is None:
-            confidence -= 0.05
+        confidence = max(
+            0.1,
+            0.75 - 0.1 * (not components) - 0.05 * (context.allowed is None),
+        )
         warnings: List[str] = []
-        return narrative, max(confidence, 0.1), warnings
+        return narrative, confidence, warnings
+
+    def explain_many(self, contexts: Sequence[ExplanationContext]) -> List[Tuple[str, float, List[str]]]:
+        """Vectorize the per-line adjustment sums before formatting narratives."""
+        if np is None or len(contexts) < 32:
+            return super().explain_many(contexts)
+        counts = np.array([len(context.adjustments) for context in contexts], dtype=np.int64)
+        totals = np.zeros(len(contexts), dtype=np.float64)
+        if counts.any():
+            amounts = np.array(
+                [adj.amount for context in contexts for adj in context.adjustments],
+                dtype=np.float64,
+            )
+            line_idx = np.repeat(np.arange(len(contexts)), counts)
+            totals = _adjustment_totals(amounts, line_idx, len(contexts))
+        return [
+            self.explain(context, total_adjustment=total)
+            for context, total in zip(contexts, totals.tolist())
+        ]
 
-    def _fallback_necessity(self, context: ExplanationContext) -> str:
-        base = "This service was performed"
-        if context.code:
-            base += f" to address the clinical need associated with code {context.code}"
-        else:
-            base += " to support the patient's treatment plan"
-        if context.provider:
-            base += f" as ordered by {context.provider}"
-        return base + "."
+
+
+def _components_for(context: ExplanationContext, currency: str) -> str:
+    """Render the patient-component description once per context."""
+    if context.components_text is None:
+        context.components_text = _describe_patient_components(context.patient_resp, currency)
+    return context.components_text
+
+
+def _prompt_key(prompt: str) -> str:
+    """Return a compact cache key for a prompt string."""
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).hexdigest()
 
 
 class LLMExplainer(BaseExplainer):
     """Wrapper around optional LLM providers for richer narratives."""
 
+    _CACHE_MAX = 10_000
+
     def __init__(self, settings: AppSettings, fallback: BaseExplainer) -> None:
         super().__init__(settings)
         self._fallback = fallback
-        self._client = self._build_client()
-
-    def _build_client(self):  # pragma: no cover - optional dependency path
-        provider = self.settings.llm_provider
-        if not provider:
-            return None
-        try:
-            if provider.lower() == "openai":
-                import openai
-
-                openai.api_key = self.settings.llm_api_key
-                return openai
-        except Exception as exc:
-            LOGGER.warning("Failed to initialize LLM provider %s: %s", provider, exc)
-        return None
-
-    def explain(self, context: ExplanationContext) -> Tuple[str, float, List[str]]:
-        if not self._client:
+        self._clients = self._build_clients()
+        self._response_cache: OrderedDict[str, str] = OrderedDict()
+
+    def _build_clients(self) -> List:  # pragma: no cover - optional dependency path
+        providers = list(self.settings.llm_providers)
+        if not providers and self.settings.llm_provider:
+            providers = [self.settings.llm_provider]
+        clients: List = []
+        for provider in providers:
+            try:
+                if provider.lower() == "openai":
+                    import openai
+
+                    openai.api_key = self.settings.llm_api_key
+                    clients.append(openai)
+                else:
+                    LOGGER.warning("Unsupported LLM provider %s; skipping", provider)
+            except Exception as exc:
+                LOGGER.warning("Failed to initialize LLM provider %s: %s", provider, exc)
+        return clients
+
+    def explain(
+        self,
+        context: ExplanationContext,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[str, float, List[str]]:
+        if not self._clients or self._is_trivial(context):
             return self._fallback.explain(context)
         prompt = self._build_prompt(context)
+        cache_key = _prompt_key(prompt)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            return cached, 0.9, []
+        request_kwargs = {
+            "model": self.settings.llm_model or _DEFAULT_LLM_MODEL,
+            "temperature": self.settings.llm_temperature,
+            "max_tokens": self.settings.llm_max_tokens,
+        }
+        if self.settings.llm_service_tier:
+            request_kwargs["service_tier"] = self.settings.llm_service_tier
+        for client in self._clients:
+            try:  # pragma: no cover - network dependent
+                response = client.ChatCompletion.create(
+                    messages=[
+                        {"role": "system", "content": _SYSTEM_PROMPT},
+                        *_FEW_SHOT_MESSAGES,
+                        {"role": "user", "content": prompt},
+                    ],
+                    stream=True,
+                    **request_kwargs,
+                )
+                pieces: List[str] = []
+                for part in response:
+                    delta = part["choices"][0].get("delta", {}).get("content")
+                    if delta:
+                        pieces.append(delta)
+                        if on_token is not None:
+                            on_token(delta)
+                content = "".join(pieces).strip()
+                self._remember(cache_key, content)
+                return content, 0.9, []
+            except Exception as exc:
+                LOGGER.warning(
+                    "LLM explanation via %s failed: %s",
+                    getattr(client, "__name__", client),
+                    exc,
+                )
+        return self._fallback.explain(context)
+
+    def _remember(self, cache_key: str, content: str) -> None:
+        """Store a successful response, evicting the oldest entry when full."""
+        self._response_cache[cache_key] = content
+        if len(self._response_cache) > self._CACHE_MAX:
+            self._response_cache.popitem(last=False)
+
+    @staticmethod
+    def _is_trivial(context: ExplanationContext) -> bool:
+        """Lines with no pricing detail gain nothing from an LLM narrative."""
+        return (
+            not context.adjustments
+            and context.allowed is None
+            and context.patient_total == 0
+        )
+
+    def explain_many(self, contexts: Sequence[ExplanationContext]) -> List[Tuple[str, float, List[str]]]:
+        """Submit all contexts as a single batch job instead of per-line calls."""
+        client = self._clients[0] if self._clients else None
+        if client is None or not hasattr(client, "batches"):
+            return super().explain_many(contexts)
+        llm_contexts = [context for context in contexts if not self._is_trivial(context)]
+        if not llm_contexts:
+            return [self._fallback.explain(context) for context in contexts]
         try:  # pragma: no cover - network dependent
-            response = self._client.ChatCompletion.create(
-                model=self.settings.llm_model or "gpt-3.5-turbo",
-                temperature=self.settings.llm_temperature,
-                max_tokens=self.settings.llm_max_tokens,
-                messages=[
+            payload = "\n".join(
+                json.dumps(
                     {
-                        "role": "system",
-                        "content": (
-                            "You are a medical billing expert. Explain each service clearly "
-                            "and justify why the patient might receive this bill. Use only "
-                            "the numbers provided."
-                        ),
-                    },
-                    {"role": "user", "content": prompt},
-                ],
+                        "custom_id": str(context.line_no),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": self.settings.llm_model or _DEFAULT_LLM_MODEL,
+                            "temperature": self.settings.llm_temperature,
+                            "max_tokens": self.settings.llm_max_tokens,
+                            "messages": [
+                                {"role": "system", "content": _SYSTEM_PROMPT},
+                                *_FEW_SHOT_MESSAGES,
+                                {"role": "user", "content": self._build_prompt(context)},
+                            ],
+                        },
+                    }
+                )
+                for context in llm_contexts
             )
-            content = response["choices"][0]["message"]["content"].strip()
-            return content, 0.9, []
+            upload = client.files.create(file=payload.encode("utf-8"), purpose="batch")
+            batch = client.batches.create(
+                input_file_id=upload.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h",
+            )
+            deadline = time.monotonic() + _BATCH_POLL_TIMEOUT
+            while batch.status not in {"completed", "failed", "expired", "cancelled"}:
+                if time.monotonic() >= deadline:
+                    raise RuntimeError("batch polling timed out")
+                time.sleep(_BATCH_POLL_INTERVAL)
+                batch = client.batches.retrieve(batch.id)
+            if batch.status != "completed":
+                raise RuntimeError(f"batch finished with status {batch.status}")
+            raw = client.files.content(batch.output_file_id).text
+            narratives: Dict[str, str] = {}
+            for line in raw.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                content = record["response"]["body"]["choices"][0]["message"]["content"]
+                narratives[record["custom_id"]] = content.strip()
         except Exception as exc:
-            LOGGER.warning("LLM explanation failed: %s", exc)
-            return self._fallback.explain(context)
+            LOGGER.warning("LLM batch explanation failed: %s", exc)
+            return [self._fallback.explain(context) for context in contexts]
+        return [
+            (narratives[str(context.line_no)], 0.9, [])
+            if str(context.line_no) in narratives
+            else self._fallback.explain(context)
+            for context in contexts
+        ]
 
     def _build_prompt(self, context: ExplanationContext) -> str:
+        currency = self.settings.output_currency
         adjustments = [
-            f"{adj.type} {self.settings.output_currency}{adj.amount:,.2f}"
-            for adj in context.adjustments
+            f"{adj.type} {_FMT_MONEY(currency, adj.amount)}" for adj in context.adjustments
         ]
-        components = _describe_patient_components(context.patient_resp, self.settings.output_currency)
-        return (
-            "Explain the following medical billing line item in two sentences. "
-            "Clarify what the service is, why it was medically necessary, and how the "
-            "math results in the patient responsibility. "
-            f"Line number: {context.line_no}. Description: {context.description}. "
-            f"Code: {context.code or 'unknown'} ({context.code_type}). Date: {context.date_of_service or 'n/a'}. "
-            f"Charge: {self.settings.output_currency}{context.charge:,.2f}. "
-            f"Allowed: {self.settings.output_currency}{context.allowed:,.2f} if available. "
-            f"Insurance paid: {self.settings.output_currency}{context.payer_paid:,.2f} if available. "
-            f"Adjustments: {', '.join(adjustments) if adjustments else 'none'}. "
-            f"Patient components: {components or 'not provided'}, total {self.settings.output_currency}{context.patient_total:,.2f}."
+        components = _components_for(context, currency)
+        return _PROMPT_TEMPLATE.format(
+            line_no=context.line_no,
+            description=context.description,
+            code=context.code or "unknown",
+            code_type=context.code_type,
+            date=context.date_of_service or "n/a",
+            charge=_FMT_MONEY(currency, context.charge),
+            allowed=_FMT_MONEY(currency, context.allowed),
+            payer_paid=_FMT_MONEY(currency, context.payer_paid),
+            adjustments=", ".join(adjustments) if adjustments else "none",
+            components=components or "not provided",
+            patient_total=_FMT_MONEY(currency, context.patient_total),
         )
 
 
+@lru_cache(maxsize=512)
+def _fallback_necessity(code: Optional[str], provider: Optional[str]) -> str:
+    """Build the generic necessity sentence, memoized per (code, provider)."""
+
+    base = "This service was performed"
+    if code:
+        base += f" to address the clinical need associated with code {code}"
+    else:
+        base += " to support the patient's treatment plan"
+    if provider:
+        base += f" as ordered by {provider}"
+    return base + "."
+
+
 def _describe_patient_components(resp: PatientResponsibility, currency: str) -> str:
-    parts: List[str] = []
-    if resp.deductible:
-        parts.append(f"deductible {currency}{resp.deductible:,.2f}")
-    if resp.copay:
-        parts.append(f"copay {currency}{resp.copay:,.2f}")
-    if resp.coinsurance:
-        parts.append(f"coinsurance {currency}{resp.coinsurance:,.2f}")
-    if resp.non_covered:
-        parts.append(f"non-covered {currency}{resp.non_covered:,.2f}")
-    for name, value in resp.other.items():
-        parts.append(f"{name} {currency}{value:,.2f}")
+    candidates = (
+        ("deductible", resp.deductible),
+        ("copay", resp.copay),
+        ("coinsurance", resp.coinsurance),
+        ("non-covered", resp.non_covered),
+    )
+    parts = [f"{name} {_FMT_MONEY(currency, value)}" for name, value in candidates if value]
+    parts.extend(f"{name} {_FMT_MONEY(currency, value)}" for name, value in resp.other.items())
     return ", ".join(parts)
 
 
@@ -1,221 +1,179 @@
 """FastAPI application exposing the medical bill explainer."""
 from __future__ import annotations
 
+import asyncio
+import gzip
+import hashlib
+import io
 import json
 import logging
+import os
 import shutil
 import tempfile
 from pathlib import Path
 
-from fastapi import FastAPI, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi import BackgroundTasks, FastAPI, File, HTTPException, Request, Response, UploadFile
+from fastapi.responses import FileResponse, JSONResponse
+from fastapi.staticfiles import StaticFiles
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from app.config import get_settings
 from app.parsing.pipeline import parse_document, parsed_document_to_dict
 from app.rendering.report import render_html, write_pdf
 
+try:  # pragma: no cover - optional dependency
+    import brotli
+except Exception:  # pragma: no cover - fallback when not installed
+    brotli = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as _JSONResponse
+except Exception:  # pragma: no cover - fallback when not installed
+    _JSONResponse = JSONResponse  # type: ignore
+
 LOGGER = logging.getLogger(__name__)
 
-app = FastAPI(title="Medical Bill Explainer", version="1.1.0")
+app = FastAPI(
+    title="Medical Bill Explainer", version="1.1.0", default_response_class=_JSONResponse
+)
+
+
+class _ImmutableStaticFiles(StaticFiles):
+    """Static files tagged as immutable; the template busts the cache via ?v=<hash>."""
+
+    def file_response(self, *args, **kwargs):  # type: ignore[override]
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+_settings = get_settings()
+_STATIC_DIR = Path(__file__).parent / "static"
+_ASSET_VERSION = hashlib.blake2b(
+    b"".join(sorted(path.read_bytes() for path in _STATIC_DIR.glob("app.*"))),
+    digest_size=8,
+).hexdigest()
+app.mount("/static", _ImmutableStaticFiles(directory=str(_STATIC_DIR)), name="static")
+_TEMPLATE_ENV = Environment(
+    loader=FileSystemLoader(str(_settings.template_dir)),
+    autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=False,
+)
+_INDEX_BODY = (
+    _TEMPLATE_ENV.get_template("index.html.j2")
+    .render(
+        disclaimer=_settings.report_footer_disclaimer,
+        asset_version=_ASSET_VERSION,
+    )
+    .encode("utf-8")
+)
+_INDEX_BODY_GZIP = gzip.compress(_INDEX_BODY, compresslevel=9)
+_INDEX_BODY_BR = brotli.compress(_INDEX_BODY, quality=11) if brotli is not None else None
+_INDEX_MEDIA_TYPE = "text/html; charset=utf-8"
+_INDEX_ETAG = '"{}"'.format(hashlib.blake2b(_INDEX_BODY, digest_size=16).hexdigest())
+
+
+
+_SMALL_UPLOAD_BYTES = 4 * 1024 * 1024
+
+
+def _spool_upload(upload: UploadFile, temp) -> None:
+    """Copy an upload into the temp file, using in-kernel sendfile when possible."""
+    source = upload.file
+    if upload.size is not None and upload.size <= _SMALL_UPLOAD_BYTES:
+        temp.write(source.read())
+        return
+    try:
+        in_fd = source.fileno()
+    except (AttributeError, OSError, ValueError):
+        in_fd = None
+    if in_fd is not None and hasattr(os, "sendfile"):
+        out_fd = temp.fileno()
+        offset = 0
+        try:
+            while True:
+                sent = os.sendfile(out_fd, in_fd, offset, 1 << 20)
+                if sent == 0:
+                    return
+                offset += sent
+        except OSError:
+            # macOS/BSD sendfile only writes to sockets; fall back to a
+            # userspace copy of whatever remains past the spooled offset.
+            source.seek(offset)
+    shutil.copyfileobj(source, temp, length=1 << 20)
+
+
+def _parse_inline(file: UploadFile, settings) -> bool:
+    """Small uploads skip the disk round-trip unless uploads are persisted."""
+    return (
+        not settings.persist_uploads
+        and file.size is not None
+        and file.size <= settings.inline_parse_threshold_bytes
+    )
 
 
 @app.post("/parse")
 async def parse_bill(file: UploadFile = File(...)) -> JSONResponse:
-    settings = get_settings()
-    suffix = Path(file.filename or "upload.pdf").suffix or ".pdf"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp:
-        shutil.copyfileobj(file.file, temp)
-        temp_path = Path(temp.name)
-    document = parse_document(temp_path, settings=settings)
+    if _parse_inline(file, _settings):
+        data = await file.read()
+        document = await asyncio.to_thread(parse_document, io.BytesIO(data), settings=_settings)
+    else:
+        suffix = Path(file.filename or "upload.pdf").suffix or ".pdf"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp:
+            await asyncio.to_thread(_spool_upload, file, temp)
+            temp_path = Path(temp.name)
+        document = await asyncio.to_thread(parse_document, temp_path, settings=_settings)
+        if not _settings.persist_uploads:
+            temp_path.unlink(missing_ok=True)
     payload = parsed_document_to_dict(document)
-    if not settings.persist_uploads:
-        temp_path.unlink(missing_ok=True)
-    return JSONResponse(payload)
+    return _JSONResponse(payload)
 
 
 @app.post("/render")
-async def render_bill(file: UploadFile = File(...)) -> FileResponse:
-    settings = get_settings()
-    suffix = Path(file.filename or "upload.pdf").suffix or ".pdf"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp:
-        shutil.copyfileobj(file.file, temp)
-        temp_path = Path(temp.name)
-    document = parse_document(temp_path, settings=settings)
-    html_content = render_html(document, settings=settings)
-    if settings.persist_uploads:
+async def render_bill(background: BackgroundTasks, file: UploadFile = File(...)) -> FileResponse:
+    temp_path: Path | None = None
+    if _parse_inline(file, _settings):
+        data = await file.read()
+        document = await asyncio.to_thread(parse_document, io.BytesIO(data), settings=_settings)
+    else:
+        suffix = Path(file.filename or "upload.pdf").suffix or ".pdf"
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp:
+            await asyncio.to_thread(_spool_upload, file, temp)
+            temp_path = Path(temp.name)
+        document = await asyncio.to_thread(parse_document, temp_path, settings=_settings)
+    html_content = await asyncio.to_thread(render_html, document, settings=_settings)
+    if _settings.persist_uploads and temp_path is not None:
         output_dir = temp_path.parent
     else:
         output_dir = Path(tempfile.mkdtemp())
+        background.add_task(shutil.rmtree, output_dir, ignore_errors=True)
     pdf_path = output_dir / "report.pdf"
     try:
-        write_pdf(document, pdf_path, html_content=html_content, settings=settings)
+        await asyncio.to_thread(
+            write_pdf, document, pdf_path, html_content=html_content, settings=_settings
+        )
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc))
-    if not settings.persist_uploads:
-        temp_path.unlink(missing_ok=True)
-    return FileResponse(path=pdf_path, media_type="application/pdf", filename="report.pdf")
+    if not _settings.persist_uploads and temp_path is not None:
+        background.add_task(temp_path.unlink, missing_ok=True)
+    return FileResponse(
+        path=pdf_path, media_type="application/pdf", filename="report.pdf", background=background
+    )
 
 
 __all__ = ["app"]
 
-@app.get("/", response_class=HTMLResponse)
-async def index() -> str:
-    return """<!DOCTYPE html>
-<html lang=\"en\">
-<head>
-<meta charset=\"utf-8\" />
-<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-<title>Medical Bill Explainer</title>
-<style>
-body { font-family: Arial, sans-serif; margin: 2rem; background: #f8fafc; }
-main { max-width: 960px; margin: auto; background: #fff; padding: 2rem; border-radius: 0.5rem; box-shadow: 0 2px 8px rgba(0,0,0,0.1); }
-header { text-align: center; margin-bottom: 2rem; }
-label { display: block; margin-bottom: 0.5rem; font-weight: bold; }
-input[type=file] { margin-bottom: 1rem; }
-button { background: #2563eb; color: white; border: none; padding: 0.75rem 1.5rem; border-radius: 0.375rem; cursor: pointer; font-size: 1rem; }
-button:disabled { background: #a5b4fc; cursor: not-allowed; }
-#results { margin-top: 2rem; }
-.card-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 1rem; }
-.card { background: #eff6ff; padding: 1rem; border-radius: 0.5rem; }
-summary { font-weight: bold; }
-.accordion { margin-top: 1.5rem; display: grid; gap: 0.75rem; }
-details.line-card { border: 1px solid #cbd5f5; border-radius: 0.5rem; padding: 0.75rem 1rem; background: #fff; }
-details.line-card summary { cursor: pointer; font-weight: 600; list-style: none; }
-details.line-card summary::-webkit-details-marker { display: none; }
-.line-body { margin-top: 0.75rem; font-size: 0.95rem; color: #1f2937; }
-.line-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(160px, 1fr)); gap: 0.5rem; margin-top: 0.75rem; }
-.line-grid div { background: #eff6ff; border-radius: 0.4rem; padding: 0.6rem; }
-.warnings { color: #dc2626; font-size: 0.85rem; margin-top: 0.5rem; }
-</style>
-</head>
-<body>
-<main>
-<header>
-<h1>Medical Bill Explainer</h1>
-<p>Upload a PDF medical bill to receive a plain-language summary.</p>
-</header>
-<section>
-<label for=\"file\">Medical bill PDF</label>
-<input id=\"file\" type=\"file\" accept=\"application/pdf\" />
-<button id=\"uploadBtn\">Upload and Analyze</button>
-</section>
-<section id=\"status\"></section>
-<section id=\"results\" hidden>
-<div class=\"card-grid\">
-<div class=\"card\"><h3>Total Charge</h3><p id=\"total-charge\"></p></div>
-<div class=\"card\"><h3>Total Allowed</h3><p id=\"total-allowed\"></p></div>
-<div class=\"card\"><h3>Insurer Paid</h3><p id=\"payer-paid\"></p></div>
-<div class=\"card\"><h3>Patient Owes</h3><p id=\"patient-owes\"></p></div>
-</div>
-<div class=\"accordion\" id=\"lines\"></div>
-<a id=\"download-json\" download=\"parsed.json\">Download JSON</a>
-</section>
-<footer style=\"margin-top:2rem; font-size:0.875rem; color:#475569;\">Educational summary, not medical or legal advice.</footer>
-</main>
-<script>
-const uploadBtn = document.getElementById('uploadBtn');
-const fileInput = document.getElementById('file');
-const statusEl = document.getElementById('status');
-const results = document.getElementById('results');
-const totals = {
-  charge: document.getElementById('total-charge'),
-  allowed: document.getElementById('total-allowed'),
-  payer: document.getElementById('payer-paid'),
-  patient: document.getElementById('patient-owes'),
-};
-const linesContainer = document.getElementById('lines');
-const downloadJson = document.getElementById('download-json');
-
-uploadBtn.addEventListener('click', async () => {
-  if (!fileInput.files.length) {
-    statusEl.textContent = 'Please select a PDF file first.';
-    return;
-  }
-  uploadBtn.disabled = true;
-  statusEl.textContent = 'Uploading and parsing…';
-  const form = new FormData();
-  form.append('file', fileInput.files[0]);
-  try {
-    const response = await fetch('/parse', { method: 'POST', body: form });
-    if (!response.ok) {
-      throw new Error('Parsing failed.');
-    }
-    const payload = await response.json();
-    statusEl.textContent = 'Completed.';
-    results.hidden = false;
-    totals.charge.textContent = formatCurrency(payload.totals.total_charge);
-    totals.allowed.textContent = formatCurrency(payload.totals.total_allowed);
-    totals.payer.textContent = formatCurrency(payload.totals.payer_paid);
-    totals.patient.textContent = formatCurrency(payload.totals.patient_owes);
-    linesContainer.innerHTML = '';
-    payload.lines.forEach(line => {
-      const card = document.createElement('details');
-      card.className = 'line-card';
-      const summary = document.createElement('summary');
-      const headingCode = line.code ? ` (${line.code})` : '';
-      summary.textContent = `Line ${line.line_no}${headingCode}: ${line.description_raw}`;
-      card.appendChild(summary);
-
-      const body = document.createElement('div');
-      body.className = 'line-body';
-      const narrative = document.createElement('p');
-      narrative.textContent = line.explanation;
-      body.appendChild(narrative);
-
-      const grid = document.createElement('div');
-      grid.className = 'line-grid';
-      const numericFields = [
-        ['charge', 'Charge'],
-        ['allowed', 'Allowed'],
-        ['payer_paid', 'Insurance Paid'],
-        ['patient_owes_line', 'Patient Owes'],
-        ['confidence', 'Confidence'],
-      ];
-      numericFields.forEach(([field, label]) => {
-        if (line[field] !== null && line[field] !== undefined) {
-          const cell = document.createElement('div');
-          const value = field === 'confidence' ? `${(line[field] * 100).toFixed(0)}%` : formatCurrency(line[field]);
-          cell.innerHTML = `<strong>${label}</strong><br>${value}`;
-          grid.appendChild(cell);
-        }
-      });
-      body.appendChild(grid);
-
-      if (line.patient_resp_components) {
-        const respEntries = Object.entries(line.patient_resp_components).filter(([, value]) => value);
-        if (respEntries.length) {
-          const resp = document.createElement('div');
-          resp.style.marginTop = '0.75rem';
-          resp.innerHTML = `<strong>Patient responsibility breakdown:</strong> ${respEntries.map(([name, value]) => `${name.replace(/_/g, ' ')} ${formatCurrency(value)}`).join(', ')}`;
-          body.appendChild(resp);
-        }
-      }
-
-      if (line.warnings && line.warnings.length) {
-        const warn = document.createElement('div');
-        warn.className = 'warnings';
-        warn.textContent = `Warnings: ${line.warnings.join(', ')}`;
-        body.appendChild(warn);
-      }
-
-      card.appendChild(body);
-      linesContainer.appendChild(card);
-    });
-    downloadJson.href = URL.createObjectURL(new Blob([JSON.stringify(payload, null, 2)], { type: 'application/json' }));
-  } catch (err) {
-    console.error(err);
-    statusEl.textContent = 'An error occurred while parsing the document.';
-  } finally {
-    uploadBtn.disabled = false;
-  }
-});
-
-function formatCurrency(value) {
-  if (value === null || value === undefined) {
-    return '—';
-  }
-  return new Intl.NumberFormat(undefined, { style: 'currency', currency: 'USD' }).format(value);
-}
-</script>
-</body>
-</html>"""
+@app.get("/")
+async def index(request: Request) -> Response:
+    headers = {"Vary": "Accept-Encoding", "ETag": _INDEX_ETAG}
+    if request.headers.get("if-none-match") == _INDEX_ETAG:
+        return Response(status_code=304, headers=headers)
+    accept_encoding = request.headers.get("accept-encoding", "")
+    if _INDEX_BODY_BR is not None and "br" in accept_encoding:
+        headers["Content-Encoding"] = "br"
+        return Response(_INDEX_BODY_BR, media_type=_INDEX_MEDIA_TYPE, headers=headers)
+    if "gzip" in accept_encoding:
+        headers["Content-Encoding"] = "gzip"
+        return Response(_INDEX_BODY_GZIP, media_type=_INDEX_MEDIA_TYPE, headers=headers)
+    return Response(_INDEX_BODY, media_type=_INDEX_MEDIA_TYPE, headers=headers)
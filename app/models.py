@@ -6,7 +6,7 @@ from datetime import date
 from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Adjustment:
     """Represents a financial adjustment applied to a line item."""
 
@@ -14,7 +14,7 @@ class Adjustment:
     amount: float
 
 
-@dataclass
+@dataclass(slots=True)
 class PatientResponsibility:
     """Breakdown of patient responsibility components."""
 
@@ -27,10 +27,10 @@ class PatientResponsibility:
     def total(self) -> float:
         """Return the total patient responsibility for the line."""
         base = self.deductible + self.copay + self.coinsurance + self.non_covered
-        return base + sum(self.other.values())
+        return base + sum(self.other.values()) if self.other else base
 
 
-@dataclass
+@dataclass(slots=True)
 class LineItem:
     """Represents a parsed line item from a medical bill."""
 
@@ -52,7 +52,7 @@ class LineItem:
     warnings: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Header:
     """Document header metadata."""
 
@@ -64,7 +64,7 @@ class Header:
     dos_end: Optional[date]
 
 
-@dataclass
+@dataclass(slots=True)
 class Totals:
     """Aggregated totals for the document."""
 
@@ -76,7 +76,7 @@ class Totals:
     reconciles: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class MathCheck:
     """Result of a math validation check."""
 
@@ -85,7 +85,7 @@ class MathCheck:
     details: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedDocument:
     """Complete parsed representation of a medical bill."""
 
@@ -0,0 +1,91 @@
+"""Optional compiled kernel for batch reconciliation arithmetic."""
+from __future__ import annotations
+
+from typing import List, Sequence
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - fallback when not installed
+    np = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    from numba import njit, prange
+except Exception:  # pragma: no cover - fallback when not installed
+    njit = None  # type: ignore
+    prange = range  # type: ignore
+
+
+def _reconcile_py(
+    charges: Sequence[float],
+    adjustments: Sequence[float],
+    paid: Sequence[float],
+    owes: Sequence[float],
+    tol: float,
+) -> List[bool]:
+    return [
+        abs(charge + adjustment - payer - patient) < tol
+        for charge, adjustment, payer, patient in zip(charges, adjustments, paid, owes)
+    ]
+
+
+if np is not None and njit is not None:  # pragma: no cover - requires numba
+
+    @njit(cache=True, fastmath=True)
+    def _reconcile_kernel(charges, adjustments, paid, owes, tol):
+        out = np.empty(charges.shape[0], dtype=np.bool_)
+        for i in range(charges.shape[0]):
+            out[i] = abs(charges[i] + adjustments[i] - paid[i] - owes[i]) < tol
+        return out
+
+    def reconcile(charges, adjustments, paid, owes, tol: float = 0.05) -> List[bool]:
+        """Return per-document reconciliation flags for equal-length columns."""
+        return list(
+            _reconcile_kernel(
+                np.asarray(charges, dtype=np.float64),
+                np.asarray(adjustments, dtype=np.float64),
+                np.asarray(paid, dtype=np.float64),
+                np.asarray(owes, dtype=np.float64),
+                tol,
+            )
+        )
+
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _residuals_kernel(charges, adjustments, paid, owes):
+        out = np.empty_like(charges)
+        for i in prange(charges.shape[0]):
+            out[i] = charges[i] + adjustments[i] - paid[i] - owes[i]
+        return out
+
+    def residuals(charges, adjustments, paid, owes) -> List[float]:
+        """Return per-line balance residuals for equal-length columns."""
+        return list(
+            _residuals_kernel(
+                np.asarray(charges, dtype=np.float64),
+                np.asarray(adjustments, dtype=np.float64),
+                np.asarray(paid, dtype=np.float64),
+                np.asarray(owes, dtype=np.float64),
+            )
+        )
+
+else:
+
+    def reconcile(charges, adjustments, paid, owes, tol: float = 0.05) -> List[bool]:
+        """Return per-document reconciliation flags for equal-length columns."""
+        return _reconcile_py(charges, adjustments, paid, owes, tol)
+
+    def residuals(charges, adjustments, paid, owes) -> List[float]:
+        """Return per-line balance residuals for equal-length columns."""
+        if np is not None:
+            return (
+                np.asarray(charges, dtype=np.float64)
+                + np.asarray(adjustments, dtype=np.float64)
+                - np.asarray(paid, dtype=np.float64)
+                - np.asarray(owes, dtype=np.float64)
+            ).tolist()
+        return [
+            charge + adjustment - payer - patient
+            for charge, adjustment, payer, patient in zip(charges, adjustments, paid, owes)
+        ]
+
+
+__all__ = ["reconcile", "residuals"]
@@ -1,14 +1,20 @@
 """Main deterministic parsing pipeline for medical bills."""
 from __future__ import annotations
 
+import hashlib
+import io
 import logging
+import operator
+import os
 import re
-from dataclasses import asdict
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import zip_longest
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
-
-import rapidfuzz.process
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from app.config import AppSettings, get_settings
 from app.explainers import ExplanationContext, build_explainer
@@ -21,50 +27,89 @@ from app.models import (
     PatientResponsibility,
     Totals,
 )
-from app.pdf_utils import extract_text, iter_tables
+from app.parsing import math_numba
+from app.pdf_utils import PdfSource, extract_text, iter_tables
 from app.redaction import redact_text
 
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - fallback when not installed
+    np = None  # type: ignore
+
+try:  # pragma: no cover - optional dependency
+    from fastnumbers import fast_float
+except Exception:  # pragma: no cover - fallback when not installed
+    fast_float = None  # type: ignore
+
 LOGGER = logging.getLogger(__name__)
 
+#: Below this line count the NumPy round-trip costs more than it saves.
+_VECTORIZE_MIN_LINES = 32
+
+_MULTISPACE_RE = re.compile(r"\s{2,}")
+_MODIFIER_SPLIT_RE = re.compile(r"[,\s]+")
+_CODE_RE = re.compile(r"\b([A-Z]{1,2}\d{3,4}|\d{4,5})\b")
+
+_AMOUNT_TBL = str.maketrans("", "", "$,() \t")
+
+#: Bill headers appear near the top of the document; stop scanning past this.
+_HEADER_SEARCH_MAX_LINES = 400
+
+_PRESP_PREFIX = "patient_resp_"
+
 
 def _parse_amount(value: str | float | int | None) -> Optional[float]:
     if value is None:
         return None
     if isinstance(value, (int, float)):
         return float(value)
-    cleaned = str(value).replace("$", "").replace(",", "").strip()
-    if cleaned == "":
+    text = str(value).strip()
+    if not text:
         return None
-    multiplier = -1.0 if cleaned.startswith("(") and cleaned.endswith(")") else 1.0
-    cleaned = cleaned.strip("()")
+    negative = text.startswith("(") and text.endswith(")")
+    cleaned = text.translate(_AMOUNT_TBL)
+    if not cleaned:
+        return None
+    if fast_float is not None:
+        parsed = fast_float(cleaned, default=None)
+        if parsed is None:
+            LOGGER.debug("Failed to parse amount: %s", value)
+            return None
+        return -parsed if negative else parsed
     try:
-        return float(cleaned) * multiplier
+        parsed = float(cleaned)
     except ValueError:
         LOGGER.debug("Failed to parse amount: %s", value)
         return None
+    return -parsed if negative else parsed
+
+
+_HEADER_KEYWORDS = (
+    ("clinic", "provider"),
+    ("insurance", "payer"),
+    ("patient", "patient"),
+    ("account", "account"),
+)
 
 
 def _normalize_header(raw_text: str, settings: AppSettings) -> Header:
     """Extract basic header metadata with naive heuristics."""
-    provider = None
-    payer = None
-    patient = None
-    account = None
+    fields: Dict[str, str] = {}
     lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
     for line in lines[:10]:
-        if provider is None and "clinic" in line.lower():
-            provider = line
-        if payer is None and "insurance" in line.lower():
-            payer = line
-        if patient is None and "patient" in line.lower():
-            patient = line
-        if account is None and "account" in line.lower():
-            account = line
+        lowered = line.lower()
+        for keyword, name in _HEADER_KEYWORDS:
+            if name not in fields and keyword in lowered:
+                fields[name] = line
+        if len(fields) == len(_HEADER_KEYWORDS):
+            break
+    patient = fields.get("patient")
+    account = fields.get("account")
     redacted_patient = redact_text(patient or "") if settings.redact_phi else patient
     redacted_account = redact_text(account or "") if settings.redact_phi else account
     return Header(
-        provider=provider,
-        payer=payer,
+        provider=fields.get("provider"),
+        payer=fields.get("payer"),
         patient=redacted_patient,
         account_number=redacted_account,
         dos_start=None,
@@ -72,12 +117,25 @@ def _normalize_header(raw_text: str, settings: AppSettings) -> Header:
     )
 
 
+@lru_cache(maxsize=8)
+def _synonym_map_for(synonym_items: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Dict[str, str]:
+    return {
+        synonym: canonical
+        for canonical, synonyms in synonym_items
+        for synonym in (canonical, *synonyms)
+    }
+
+
+def _synonym_map(settings: AppSettings) -> Dict[str, str]:
+    """Reverse synonym-to-canonical mapping, cached on the synonym config itself."""
+    return _synonym_map_for(
+        tuple(sorted((key, tuple(values)) for key, values in settings.header_synonyms.items()))
+    )
+
+
 def _canonicalize_header(header: str, settings: AppSettings) -> str:
     label = header.strip().lower()
-    for canonical, synonyms in settings.header_synonyms.items():
-        if label == canonical or label in synonyms:
-            return canonical
-    return label
+    return _synonym_map(settings).get(label, label)
 
 
 def _normalize_headers(headers: Sequence[str], settings: AppSettings) -> List[str]:
@@ -88,7 +146,7 @@ def _normalize_headers(headers: Sequence[str], settings: AppSettings) -> List[st
 
 
 def _row_to_map(headers: Sequence[str], row: Sequence[str]) -> Dict[str, str]:
-    return {headers[i]: (row[i] if i < len(row) else "") for i in range(len(headers))}
+    return dict(zip_longest(headers, row[: len(headers)], fillvalue=""))
 
 
 def _parse_table(
@@ -96,39 +154,44 @@ def _parse_table(
     settings: AppSettings,
     explainer,
     line_offset: int,
-) -> Tuple[List[LineItem], int]:
+) -> Iterator[Tuple[LineItem, ExplanationContext]]:
+    """Yield line items (with their explanation contexts) from a table so
+    callers can extend without an extra list."""
     headers = _normalize_headers(table[0], settings)
-    rows = table[1:]
-    lines: List[LineItem] = []
     line_no = line_offset
-    for row in rows:
+    for row in table[1:]:
         if not any(cell.strip() for cell in row):
             continue
         row_map = _row_to_map(headers, row)
-        line = _build_line_item(row_map, line_no, settings, explainer, base_confidence=0.75, source="table")
-        lines.append(line)
+        item = _build_line_item(row_map, line_no, settings, explainer, base_confidence=0.75, source="table")
+        if item is None:
+            continue
+        yield item
         line_no += 1
-    return lines, line_no
 
 
-def _parse_text_rows(raw_text: str, settings: AppSettings, explainer, line_offset: int) -> Tuple[List[LineItem], int]:
+def _parse_text_rows(
+    raw_text: str, settings: AppSettings, explainer, line_offset: int
+) -> Tuple[List[Tuple[LineItem, ExplanationContext]], int]:
     """Fallback parser for tab or whitespace separated tables in raw text."""
+    if "charge" not in raw_text.lower():
+        return [], line_offset
     lines = raw_text.splitlines()
-    header_line = None
-    for line in lines:
-        lowered = line.lower()
+    for header_idx, header_line in enumerate(lines):
+        if header_idx > _HEADER_SEARCH_MAX_LINES:
+            return [], line_offset
+        lowered = header_line.lower()
         if "charge" in lowered and ("allowed" in lowered or "insurance" in lowered or "patient" in lowered):
-            header_line = line
             break
-    if not header_line:
+    else:
         return [], line_offset
     if "\t" in header_line:
         headers = [h.strip().lower() for h in header_line.split("\t")]
     else:
-        headers = [h.strip().lower() for h in re.split(r"\s{2,}", header_line)]
+        headers = [h.strip().lower() for h in _MULTISPACE_RE.split(header_line)]
     headers = _normalize_headers(headers, settings)
-    data_lines = lines[lines.index(header_line) + 1 :]
-    parsed_lines: List[LineItem] = []
+    data_lines = lines[header_idx + 1 :]
+    parsed_lines: List[Tuple[LineItem, ExplanationContext]] = []
     line_no = line_offset
     for row in data_lines:
         if not row.strip():
@@ -136,11 +199,11 @@ def _parse_text_rows(raw_text: str, settings: AppSettings, explainer, line_offse
         if "\t" in row:
             cells = row.split("\t")
         else:
-            cells = re.split(r"\s{2,}", row)
+            cells = _MULTISPACE_RE.split(row)
         if len(cells) < 3:
             continue
         row_map = _row_to_map(headers, [cell.strip() for cell in cells])
-        line = _build_line_item(
+        pair = _build_line_item(
             row_map,
             line_no,
             settings,
@@ -148,8 +211,10 @@ def _parse_text_rows(raw_text: str, settings: AppSettings, explainer, line_offse
             base_confidence=0.55,
             source="text",
         )
-        line.warnings.append("Parsed from raw text")
-        parsed_lines.append(line)
+        if pair is None:
+            continue
+        pair[0].warnings.append("Parsed from raw text")
+        parsed_lines.append(pair)
         line_no += 1
     return parsed_lines, line_no
 
@@ -161,40 +226,58 @@ def _build_line_item(
     explainer,
     base_confidence: float,
     source: str,
-) -> LineItem:
-    description = row_map.get("description") or row_map.get("service") or row_map.get("item") or ""
-    description = description.strip()
-    raw_code = row_map.get("code", "").strip()
+) -> Optional[Tuple[LineItem, ExplanationContext]]:
+    get = row_map.get
+    # Headers pass through _normalize_headers first, so synonyms like
+    # "service"/"item" are already canonicalized to "description".
+    description = (get("description") or "").strip()
+    raw_code = get("code", "").strip()
     code = raw_code or _extract_code_from_description(description)
-    code_type = row_map.get("code_type", "UNKNOWN").strip().upper() or "UNKNOWN"
-    modifiers_raw = row_map.get("modifiers", "").strip()
-    modifiers = [m.strip() for m in re.split(r"[,\s]+", modifiers_raw) if m.strip()] if modifiers_raw else []
-    units = _parse_amount(row_map.get("units"))
+    code_type = get("code_type", "UNKNOWN").strip().upper() or "UNKNOWN"
+    modifiers_raw = get("modifiers", "").strip()
+    modifiers = [m.strip() for m in _MODIFIER_SPLIT_RE.split(modifiers_raw) if m.strip()] if modifiers_raw else []
+    units = _parse_amount(get("units"))
     if units is not None:
         units = float(units)
-    date_of_service = _parse_date(row_map.get("date_of_service"), settings)
-    charge = _parse_amount(row_map.get("charge")) or 0.0
-    allowed = _parse_amount(row_map.get("allowed"))
-    payer_paid = _parse_amount(row_map.get("payer_paid"))
-    adjustment_value = _parse_amount(row_map.get("adjustment"))
+    date_of_service = _parse_date(get("date_of_service"), settings)
+    charge = _parse_amount(get("charge")) or 0.0
+    allowed = _parse_amount(get("allowed"))
+    payer_paid = _parse_amount(get("payer_paid"))
+    adjustment_value = _parse_amount(get("adjustment"))
     adjustments: List[Adjustment] = []
+    adj_total = 0.0
     if adjustment_value is not None and adjustment_value != 0:
         adjustments.append(Adjustment(type="contractual", amount=adjustment_value))
+        adj_total = adjustment_value
 
     patient_resp = PatientResponsibility(
-        deductible=_parse_amount(row_map.get("deductible")) or 0.0,
-        copay=_parse_amount(row_map.get("copay")) or 0.0,
-        coinsurance=_parse_amount(row_map.get("coinsurance")) or 0.0,
-        non_covered=_parse_amount(row_map.get("non_covered")) or 0.0,
+        deductible=_parse_amount(get("deductible")) or 0.0,
+        copay=_parse_amount(get("copay")) or 0.0,
+        coinsurance=_parse_amount(get("coinsurance")) or 0.0,
+        non_covered=_parse_amount(get("non_covered")) or 0.0,
     )
-    other_components = {k: _parse_amount(v) or 0.0 for k, v in row_map.items() if k.startswith("patient_resp_")}
-    patient_resp.other.update({k.replace("patient_resp_", ""): v for k, v in other_components.items() if v})
+    for key, value in row_map.items():
+        if key.startswith(_PRESP_PREFIX) and key != "patient_resp_total":
+            amount = _parse_amount(value)
+            if amount:
+                patient_resp.other[key.removeprefix(_PRESP_PREFIX)] = amount
 
     patient_total = patient_resp.total()
-    explicit_patient_total = _parse_amount(row_map.get("patient_resp_total"))
+    explicit_patient_total = _parse_amount(get("patient_resp_total"))
+    if (
+        charge == 0.0
+        and allowed is None
+        and payer_paid is None
+        and not adjustments
+        and patient_total == 0
+        and not explicit_patient_total
+    ):
+        # Subtotal separators, blank rows, and repeated page headers carry no
+        # money; skip them before paying for an explainer call.
+        return None
     if explicit_patient_total is not None and explicit_patient_total > 0:
         patient_total = explicit_patient_total
-    derived_patient = charge + sum(adj.amount for adj in adjustments) - (payer_paid or 0.0)
+    derived_patient = charge + adj_total - (payer_paid or 0.0)
     if patient_total == 0 and derived_patient > 0:
         patient_total = derived_patient
     elif abs(derived_patient - patient_total) > 0.05:
@@ -217,6 +300,7 @@ def _build_line_item(
         units=units,
         provider=None,
         payer=None,
+        total_adjustment=adj_total,
     )
     explanation, narrative_confidence, explanation_warnings = explainer.explain(explanation_context)
 
@@ -225,7 +309,7 @@ def _build_line_item(
     if source == "text":
         confidence -= 0.1
 
-    return LineItem(
+    line = LineItem(
         line_no=line_no,
         date_of_service=date_of_service,
         code_type=code_type,
@@ -243,13 +327,90 @@ def _build_line_item(
         confidence=max(confidence, 0.1),
         warnings=warnings,
     )
+    return line, explanation_context
+
+
+def _cents(value: Optional[float]) -> Optional[int]:
+    return None if value is None else int(round(value * 100))
+
+
+def _explain_cache_key(line: LineItem) -> tuple:
+    """Hashable digest of every line field that feeds the narrative."""
+    resp = line.patient_resp
+    return (
+        line.description_raw,
+        line.code,
+        line.code_type,
+        line.date_of_service,
+        line.units,
+        _cents(line.charge),
+        _cents(line.allowed),
+        _cents(line.payer_paid),
+        _cents(line.patient_owes_line),
+        tuple((adj.type, _cents(adj.amount)) for adj in line.adjustments),
+        (
+            _cents(resp.deductible),
+            _cents(resp.copay),
+            _cents(resp.coinsurance),
+            _cents(resp.non_covered),
+            tuple(sorted(resp.other.items())),
+        ),
+    )
+
+
+#: strptime directives translatable to named regex groups.
+_DATE_TOKEN_PATTERNS = {
+    "%Y": r"(?P<y>\d{4})",
+    "%m": r"(?P<m>\d{1,2})",
+    "%d": r"(?P<d>\d{1,2})",
+}
+
+
+@lru_cache(maxsize=8)
+def _compiled_date_formats(formats: Tuple[str, ...]) -> Tuple[Tuple[Optional["re.Pattern[str]"], str], ...]:
+    """Compile each date format to a regex; strptime stays the fallback for
+    directives the token table does not cover."""
+    compiled: List[Tuple[Optional["re.Pattern[str]"], str]] = []
+    for fmt in formats:
+        pattern = ""
+        idx = 0
+        seen = set()
+        translatable = True
+        while idx < len(fmt):
+            if fmt[idx] == "%":
+                token = fmt[idx : idx + 2]
+                replacement = _DATE_TOKEN_PATTERNS.get(token)
+                if replacement is None:
+                    translatable = False
+                    break
+                seen.add(token)
+                pattern += replacement
+                idx += 2
+            else:
+                pattern += re.escape(fmt[idx])
+                idx += 1
+        # _parse_date indexes all three named groups, so a partial format
+        # (e.g. "%m/%Y") must keep the strptime fallback.
+        if translatable and seen == set(_DATE_TOKEN_PATTERNS):
+            compiled.append((re.compile(pattern + r"\Z"), fmt))
+        else:
+            compiled.append((None, fmt))
+    return tuple(compiled)
 
 
 def _parse_date(value: Optional[str], settings: AppSettings):
     if not value:
         return None
     value = value.strip()
-    for fmt in settings.date_formats:
+    for regex, fmt in _compiled_date_formats(tuple(settings.date_formats)):
+        if regex is not None:
+            match = regex.match(value)
+            if not match:
+                continue
+            try:
+                return date(int(match["y"]), int(match["m"]), int(match["d"]))
+            except ValueError:
+                continue
         try:
             return datetime.strptime(value, fmt).date()
         except ValueError:
@@ -258,40 +419,44 @@ def _parse_date(value: Optional[str], settings: AppSettings):
 
 
 def _extract_code_from_description(description: str) -> Optional[str]:
-    matches = re.findall(r"\b([A-Z]{1,2}\d{3,4}|\d{4,5})\b", description)
-    return matches[0] if matches else None
+    match = _CODE_RE.search(description)
+    return match.group(1) if match else None
 
 
-def parse_document(pdf_path: Path, settings: Optional[AppSettings] = None) -> ParsedDocument:
+def parse_document(pdf_path: PdfSource, settings: Optional[AppSettings] = None) -> ParsedDocument:
     settings = settings or get_settings()
     explainer = build_explainer(settings)
+    # pdf_utils extracts text and tables in one pass and caches by source,
+    # so the second call below reuses the same parse.
     raw_text = extract_text(pdf_path)
+    tables = iter_tables(pdf_path)
     header = _normalize_header(raw_text, settings)
     header.provider = header.provider or None
     header.payer = header.payer or None
 
-    tables = iter_tables(pdf_path)
-    lines: List[LineItem] = []
+    items: List[Tuple[LineItem, Optional[ExplanationContext]]] = []
     current_line_no = 1
     for table in tables:
         if not table:
             continue
         try:
-            parsed, current_line_no = _parse_table(table, settings, explainer, current_line_no)
-            lines.extend(parsed)
+            # Materialize before extending so a mid-table failure discards the
+            # whole table instead of leaving partial rows with stale line numbers.
+            parsed = list(_parse_table(table, settings, explainer, current_line_no))
         except Exception as exc:  # pragma: no cover - logging path
             LOGGER.warning("Failed to parse table: %s", exc)
-    if not lines:
+            continue
+        items.extend(parsed)
+        current_line_no += len(parsed)
+    if not items:
         parsed, current_line_no = _parse_text_rows(raw_text, settings, explainer, current_line_no)
-        lines.extend(parsed)
-    if not lines:
+        items.extend(parsed)
+    if not items:
         total_charge = 0.0
-        totals_match = rapidfuzz.process.extractOne("total", raw_text.splitlines())
-        if totals_match:
-            _, _, idx = totals_match
-            candidate_line = raw_text.splitlines()[idx]
-            amount = _parse_amount(candidate_line.split()[-1]) or 0.0
-            total_charge = amount
+        for candidate_line in raw_text.splitlines():
+            if "total" in candidate_line.lower():
+                total_charge = _parse_amount(candidate_line.split()[-1]) or 0.0
+                break
         placeholder = LineItem(
             line_no=1,
             date_of_service=None,
@@ -310,44 +475,83 @@ def parse_document(pdf_path: Path, settings: Optional[AppSettings] = None) -> Pa
             confidence=0.1,
             warnings=["Table extraction failed"],
         )
-        lines.append(placeholder)
-
-    for line in lines:
-        # enrich explanation context with header details when available
-        if header.provider or header.payer:
-            context = ExplanationContext(
-                line_no=line.line_no,
-                description=line.description_raw,
-                code=line.code,
-                code_type=line.code_type,
-                date_of_service=line.date_of_service.isoformat() if line.date_of_service else None,
-                charge=line.charge,
-                allowed=line.allowed,
-                payer_paid=line.payer_paid,
-                adjustments=line.adjustments,
-                patient_resp=line.patient_resp,
-                patient_total=line.patient_owes_line,
-                units=line.units,
-                provider=header.provider,
-                payer=header.payer,
-            )
-            narrative, confidence, warnings = explainer.explain(context)
+        items.append((placeholder, None))
+    lines = [line for line, _ in items]
+
+    if header.provider or header.payer:
+        # enrich explanation context with header details; EOBs often repeat the
+        # same code/amount combination, so memoize per parse. The narrative
+        # embeds the line number, so hits from another line rewrite the prefix.
+        explain_cache: Dict[tuple, Tuple[int, str, float, Tuple[str, ...]]] = {}
+        for line, base_context in items:
+            key = _explain_cache_key(line)
+            hit = explain_cache.get(key)
+            if hit is not None:
+                cached_line_no, narrative, confidence, warnings = hit
+                prefix = f"Line {cached_line_no}"
+                if cached_line_no != line.line_no and narrative.startswith(prefix):
+                    narrative = f"Line {line.line_no}" + narrative[len(prefix):]
+            else:
+                if base_context is not None:
+                    # _build_line_item already assembled the context; only the
+                    # header fields change, so shallow-copy instead of rebuilding.
+                    context = replace(base_context, provider=header.provider, payer=header.payer)
+                else:
+                    context = ExplanationContext(
+                        line_no=line.line_no,
+                        description=line.description_raw,
+                        code=line.code,
+                        code_type=line.code_type,
+                        date_of_service=line.date_of_service.isoformat() if line.date_of_service else None,
+                        charge=line.charge,
+                        allowed=line.allowed,
+                        payer_paid=line.payer_paid,
+                        adjustments=line.adjustments,
+                        patient_resp=line.patient_resp,
+                        patient_total=line.patient_owes_line,
+                        units=line.units,
+                        provider=header.provider,
+                        payer=header.payer,
+                    )
+                narrative, confidence, warnings = explainer.explain(context)
+                explain_cache[key] = (line.line_no, narrative, confidence, tuple(warnings))
             line.explanation = narrative
             line.confidence = max(line.confidence, confidence)
             line.warnings.extend(warnings)
 
     totals = Totals()
-    totals.total_charge = sum(line.charge for line in lines)
-    allowed_values = [line.allowed for line in lines if line.allowed is not None]
-    totals.total_allowed = sum(allowed_values) if allowed_values else 0.0
-    totals.total_adjustments = sum(sum(adj.amount for adj in line.adjustments) for line in lines)
-    totals.payer_paid = sum(line.payer_paid or 0.0 for line in lines)
-    totals.patient_owes = sum(line.patient_owes_line for line in lines)
+    count = len(lines)
+    adj_sums = [
+        sum(adj.amount for adj in line.adjustments) if line.adjustments else 0.0 for line in lines
+    ]
+    if np is not None and count >= _VECTORIZE_MIN_LINES:
+        charges = np.fromiter((line.charge for line in lines), float, count)
+        allowed_arr = np.fromiter((line.allowed or 0.0 for line in lines), float, count)
+        adjustments_arr = np.asarray(adj_sums, dtype=float)
+        paid_arr = np.fromiter((line.payer_paid or 0.0 for line in lines), float, count)
+        owes_arr = np.fromiter((line.patient_owes_line for line in lines), float, count)
+        totals.total_charge = float(charges.sum())
+        totals.total_allowed = float(allowed_arr.sum())
+        totals.total_adjustments = float(adjustments_arr.sum())
+        totals.payer_paid = float(paid_arr.sum())
+        totals.patient_owes = float(owes_arr.sum())
+        residuals = math_numba.residuals(charges, adjustments_arr, paid_arr, owes_arr)
+    else:
+        residuals = []
+        for line, adj_sum in zip(lines, adj_sums):
+            totals.total_charge += line.charge
+            if line.allowed is not None:
+                totals.total_allowed += line.allowed
+            totals.total_adjustments += adj_sum
+            totals.payer_paid += line.payer_paid or 0.0
+            totals.patient_owes += line.patient_owes_line
+            residuals.append(
+                line.charge + adj_sum - (line.payer_paid or 0.0) - line.patient_owes_line
+            )
     totals.reconciles = abs(totals.total_charge + totals.total_adjustments - totals.payer_paid - totals.patient_owes) < 0.05
 
     math_checks: List[MathCheck] = []
-    for line in lines:
-        diff = line.charge + sum(adj.amount for adj in line.adjustments) - (line.payer_paid or 0.0) - line.patient_owes_line
+    for line, diff in zip(lines, residuals):
         math_checks.append(
             MathCheck(
                 name=f"line_{line.line_no}_balance",
@@ -381,6 +585,68 @@ def parse_document(pdf_path: Path, settings: Optional[AppSettings] = None) -> Pa
     return doc
 
 
+def parse_documents(pdf_paths: Iterable[Path], workers: Optional[int] = None) -> List[ParsedDocument]:
+    """Parse a batch of PDFs in parallel, one worker process per document.
+
+    Settings are re-read via ``get_settings()`` inside each worker, so callers
+    relying on environment-based configuration get identical behavior to
+    :func:`parse_document`.
+    """
+    paths = [Path(path) for path in pdf_paths]
+    if len(paths) <= 1:
+        return [parse_document(path) for path in paths]
+    max_workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(parse_document, paths))
+
+
+_DOC_CACHE: "OrderedDict[str, Tuple[AppSettings, ParsedDocument]]" = OrderedDict()
+_DOC_CACHE_MAX = 128
+
+
+def parse_document_cached(pdf_path: PdfSource, settings: Optional[AppSettings] = None) -> ParsedDocument:
+    """Parse a PDF, reusing the cached result for previously seen content.
+
+    The key is a SHA-1 of the PDF bytes, so retries and re-renders of the same
+    upload skip the entire extraction pipeline. Callers must treat the returned
+    document as read-only.
+    """
+    if hasattr(pdf_path, "read"):
+        pdf_path.seek(0)
+        pdf_bytes = pdf_path.read()
+    else:
+        pdf_bytes = Path(pdf_path).read_bytes()
+    settings = settings or get_settings()
+    key = f"{hashlib.sha1(pdf_bytes).hexdigest()}:{id(settings)}"
+    cached = _DOC_CACHE.get(key)
+    if cached is not None and cached[0] is settings:
+        _DOC_CACHE.move_to_end(key)
+        return cached[1]
+    document = parse_document(io.BytesIO(pdf_bytes), settings=settings)
+    # Store the settings alongside the document: the pinned reference keeps
+    # id(settings) from being reused by a new instance while the entry lives.
+    _DOC_CACHE[key] = (settings, document)
+    if len(_DOC_CACHE) > _DOC_CACHE_MAX:
+        _DOC_CACHE.popitem(last=False)
+    return document
+
+
+def reconcile_documents(documents: Sequence[ParsedDocument], tol: float = 0.05) -> List[bool]:
+    """Recheck totals reconciliation across a batch of parsed documents.
+
+    Uses the optional Numba kernel in :mod:`app.parsing.math_numba` when
+    available, so validating thousands of documents stays a single compiled
+    loop instead of per-document Python arithmetic.
+    """
+    return math_numba.reconcile(
+        [doc.totals.total_charge for doc in documents],
+        [doc.totals.total_adjustments for doc in documents],
+        [doc.totals.payer_paid for doc in documents],
+        [doc.totals.patient_owes for doc in documents],
+        tol=tol,
+    )
+
+
 def _determine_doc_type(lines: Sequence[LineItem]) -> str:
     if any(line.patient_resp.total() > 0 for line in lines) and any(line.payer_paid for line in lines):
         return "eob"
@@ -389,41 +655,106 @@ def _determine_doc_type(lines: Sequence[LineItem]) -> str:
     return "unknown"
 
 
+_LINE_GET = operator.attrgetter(
+    "line_no",
+    "date_of_service",
+    "code_type",
+    "code",
+    "modifiers",
+    "description_raw",
+    "units",
+    "charge",
+    "allowed",
+    "adjustments",
+    "payer_paid",
+    "patient_resp",
+    "patient_owes_line",
+    "explanation",
+    "confidence",
+    "warnings",
+)
+
+
 def parsed_document_to_dict(document: ParsedDocument) -> Dict:
-    return {
-        "doc_type": document.doc_type,
-        "header": asdict(document.header),
-        "lines": [
+    header = document.header
+    totals = document.totals
+    lines_payload = []
+    for line in document.lines:
+        (
+            line_no,
+            date_of_service,
+            code_type,
+            code,
+            modifiers,
+            description_raw,
+            units,
+            charge,
+            allowed,
+            adjustments,
+            payer_paid,
+            patient_resp,
+            patient_owes_line,
+            explanation,
+            confidence,
+            warnings,
+        ) = _LINE_GET(line)
+        lines_payload.append(
             {
-                "line_no": line.line_no,
-                "date_of_service": line.date_of_service.isoformat() if line.date_of_service else None,
-                "code_type": line.code_type,
-                "code": line.code,
-                "modifiers": line.modifiers,
-                "description_raw": line.description_raw,
-                "units": line.units,
-                "charge": line.charge,
-                "allowed": line.allowed,
-                "adjustments": [asdict(adj) for adj in line.adjustments],
-                "payer_paid": line.payer_paid,
+                "line_no": line_no,
+                "date_of_service": date_of_service.isoformat() if date_of_service else None,
+                "code_type": code_type,
+                "code": code,
+                "modifiers": modifiers,
+                "description_raw": description_raw,
+                "units": units,
+                "charge": charge,
+                "allowed": allowed,
+                "adjustments": [{"type": adj.type, "amount": adj.amount} for adj in adjustments],
+                "payer_paid": payer_paid,
                 "patient_resp_components": {
-                    "deductible": line.patient_resp.deductible,
-                    "copay": line.patient_resp.copay,
-                    "coinsurance": line.patient_resp.coinsurance,
-                    "non_covered": line.patient_resp.non_covered,
-                    **line.patient_resp.other,
+                    "deductible": patient_resp.deductible,
+                    "copay": patient_resp.copay,
+                    "coinsurance": patient_resp.coinsurance,
+                    "non_covered": patient_resp.non_covered,
+                    **patient_resp.other,
                 },
-                "patient_owes_line": line.patient_owes_line,
-                "explanation": line.explanation,
-                "confidence": line.confidence,
-                "warnings": line.warnings,
+                "patient_owes_line": patient_owes_line,
+                "explanation": explanation,
+                "confidence": confidence,
+                "warnings": warnings,
             }
-            for line in document.lines
+        )
+    return {
+        "doc_type": document.doc_type,
+        "header": {
+            "provider": header.provider,
+            "payer": header.payer,
+            "patient": header.patient,
+            "account_number": header.account_number,
+            "dos_start": header.dos_start,
+            "dos_end": header.dos_end,
+        },
+        "lines": lines_payload,
+        "totals": {
+            "total_charge": totals.total_charge,
+            "total_allowed": totals.total_allowed,
+            "total_adjustments": totals.total_adjustments,
+            "payer_paid": totals.payer_paid,
+            "patient_owes": totals.patient_owes,
+            "reconciles": totals.reconciles,
+        },
+        "math_checks": [
+            {"name": check.name, "passed": check.passed, "details": check.details}
+            for check in document.math_checks
         ],
-        "totals": asdict(document.totals),
-        "math_checks": [asdict(check) for check in document.math_checks],
         "notes": document.notes,
     }
 
 
-__all__ = ["parse_document", "parsed_document_to_dict"]
+__all__ = [
+    "parse_document",
+    "parse_document_cached",
+    "parse_documents",
+    "parsed_document_to_dict",
+    "reconcile_documents",
+]
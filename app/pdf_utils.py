@@ -1,20 +1,44 @@
 """Utility helpers for PDF ingestion and preprocessing."""
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, List, Optional, Tuple, Union
 
 import pdfplumber
 from pypdf import PdfReader
 
 LOGGER = logging.getLogger(__name__)
 
+#: A PDF input: a filesystem path or a readable binary stream.
+PdfSource = Union[Path, BinaryIO]
 
-def detect_rotation(pdf_path: Path) -> List[int]:
+_Extracted = Tuple[str, List[List[List[str]]]]
+
+_EXTRACT_CACHE: "OrderedDict[object, _Extracted]" = OrderedDict()
+_EXTRACT_CACHE_MAX = 4
+
+#: Below this page count the fork/open cost of worker processes outweighs the win.
+_PARALLEL_MIN_PAGES = 8
+
+
+def _as_stream_or_path(pdf_source: PdfSource):
+    """Return a rewound stream, or a string path, suitable for the PDF readers."""
+    if hasattr(pdf_source, "read"):
+        pdf_source.seek(0)
+        return pdf_source
+    return str(pdf_source)
+
+
+def detect_rotation(pdf_source: PdfSource) -> List[int]:
     """Return detected rotation for each page."""
     rotations: List[int] = []
-    reader = PdfReader(str(pdf_path))
+    reader = PdfReader(_as_stream_or_path(pdf_source))
     for page in reader.pages:
         rotation = page.get("/Rotate", 0)
         rotations.append(int(rotation or 0))
@@ -22,35 +46,96 @@ def detect_rotation(pdf_path: Path) -> List[int]:
     return rotations
 
 
-def extract_text(pdf_path: Path) -> str:
-    """Extract raw text from the PDF using pdfplumber."""
+def _source_key(pdf_source: PdfSource):
+    """Fingerprint a source so text and table extraction can share one PDF pass."""
+    if hasattr(pdf_source, "read"):
+        pdf_source.seek(0)
+        return hashlib.blake2b(pdf_source.read(), digest_size=16).hexdigest()
+    path = Path(pdf_source)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _extract_page(path_str: str, page_idx: int) -> Tuple[str, Optional[List[List[str]]]]:
+    """Worker: extract text and the table from a single page of a PDF on disk."""
+    with pdfplumber.open(path_str) as pdf:
+        page = pdf.pages[page_idx]
+        try:
+            text = page.extract_text() or ""
+        except Exception as exc:  # pragma: no cover - logging path
+            LOGGER.warning("Failed to extract text from page: %s", exc)
+            text = ""
+        try:
+            table = page.extract_table()
+        except Exception as exc:  # pragma: no cover - logging path
+            LOGGER.debug("Table extraction failed on page %s: %s", page_idx + 1, exc)
+            table = None
+    return text, table
+
+
+def open_and_extract(pdf_source: PdfSource) -> _Extracted:
+    """Extract page text and tables in a single pdfplumber pass.
+
+    Results for the most recent sources are cached, so calling
+    :func:`extract_text` followed by :func:`iter_tables` parses the PDF once
+    instead of twice.
+    """
+    key = _source_key(pdf_source)
+    if key is not None:
+        cached = _EXTRACT_CACHE.get(key)
+        if cached is not None:
+            _EXTRACT_CACHE.move_to_end(key)
+            return cached
+    is_path = not hasattr(pdf_source, "read")
     text_parts: List[str] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page in pdf.pages:
-            try:
-                text_parts.append(page.extract_text() or "")
-            except Exception as exc:  # pragma: no cover - logging path
-                LOGGER.warning("Failed to extract text from page: %s", exc)
-    return "\n".join(text_parts)
+    tables: List[List[List[str]]] = []
+    n_pages = 0
+    with pdfplumber.open(_as_stream_or_path(pdf_source)) as pdf:
+        n_pages = len(pdf.pages)
+        if not (is_path and n_pages >= _PARALLEL_MIN_PAGES and (os.cpu_count() or 1) > 1):
+            text_parts = [""] * n_pages
+            for page_idx, page in enumerate(pdf.pages):
+                try:
+                    text_parts[page_idx] = page.extract_text() or ""
+                except Exception as exc:  # pragma: no cover - logging path
+                    LOGGER.warning("Failed to extract text from page: %s", exc)
+                try:
+                    table = page.extract_table()
+                    if table:
+                        tables.append(table)
+                except Exception as exc:  # pragma: no cover - logging path
+                    LOGGER.debug("Table extraction failed on page %s: %s", page_idx + 1, exc)
+            n_pages = 0
+    if n_pages:  # pragma: no cover - requires a large multi-page fixture
+        workers = min(os.cpu_count() or 1, n_pages)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pages = list(executor.map(_extract_page, repeat(str(pdf_source)), range(n_pages)))
+        text_parts = [text for text, _ in pages]
+        tables = [table for _, table in pages if table]
+    result = ("\n".join(text_parts), tables)
+    if key is not None:
+        _EXTRACT_CACHE[key] = result
+        if len(_EXTRACT_CACHE) > _EXTRACT_CACHE_MAX:
+            _EXTRACT_CACHE.popitem(last=False)
+    return result
 
 
-def iter_tables(pdf_path: Path, flavor: str = "lattice") -> List[List[List[str]]]:
+def extract_text(pdf_source: PdfSource) -> str:
+    """Extract raw text from the PDF using pdfplumber."""
+    return open_and_extract(pdf_source)[0]
+
+
+def iter_tables(pdf_source: PdfSource, flavor: str = "lattice") -> List[List[List[str]]]:
     """Extract tables from the PDF using pdfplumber as a lightweight fallback."""
-    tables: List[List[List[str]]] = []
-    with pdfplumber.open(str(pdf_path)) as pdf:
-        for page_idx, page in enumerate(pdf.pages, start=1):
-            try:
-                table = page.extract_table()
-                if table:
-                    tables.append(table)
-            except Exception as exc:  # pragma: no cover - logging path
-                LOGGER.debug("Table extraction failed on page %s: %s", page_idx, exc)
-    return tables
-
-
-def is_scanned(pdf_path: Path) -> bool:
+    return open_and_extract(pdf_source)[1]
+
+
+def is_scanned(pdf_source: PdfSource) -> bool:
     """Heuristic to determine if the PDF is likely scanned (no embedded text)."""
-    text = extract_text(pdf_path)
+    text = extract_text(pdf_source)
     return len(text.strip()) == 0
 
 
@@ -60,4 +145,12 @@ def ensure_directory(path: Path) -> None:
         path.mkdir(parents=True, exist_ok=True)
 
 
-__all__ = ["detect_rotation", "extract_text", "iter_tables", "is_scanned", "ensure_directory"]
+__all__ = [
+    "PdfSource",
+    "detect_rotation",
+    "open_and_extract",
+    "extract_text",
+    "iter_tables",
+    "is_scanned",
+    "ensure_directory",
+]
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import json
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict
 
@@ -9,6 +11,7 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from app.config import AppSettings, get_settings
 from app.models import ParsedDocument
+from app.parsing.pipeline import parsed_document_to_dict
 from app.pdf_utils import ensure_directory
 
 try:  # pragma: no cover - optional dependency
@@ -16,44 +19,75 @@ try:  # pragma: no cover - optional dependency
 except Exception:  # pragma: no cover - fallback when not installed
     HTML = None  # type: ignore
 
-
-def _build_environment(settings: AppSettings) -> Environment:
-    loader = FileSystemLoader(str(settings.template_dir))
-    return Environment(loader=loader, autoescape=select_autoescape(["html", "xml"]))
+try:  # pragma: no cover - optional dependency
+    import orjson
+except Exception:  # pragma: no cover - fallback when not installed
+    orjson = None  # type: ignore
+
+
+@lru_cache(maxsize=8)
+def _build_environment(template_dir: str) -> Environment:
+    """Environment per template directory; templates compile once per process."""
+    loader = FileSystemLoader(template_dir)
+    return Environment(
+        loader=loader,
+        autoescape=select_autoescape(["html", "xml"]),
+        auto_reload=False,
+        cache_size=400,
+    )
 
 
 def render_html(document: ParsedDocument, settings: AppSettings | None = None) -> str:
     settings = settings or get_settings()
-    env = _build_environment(settings)
+    env = _build_environment(str(settings.template_dir))
     template = env.get_template("report.html.j2")
     return template.render(document=document, settings=settings)
 
 
+def render_html_to(document: ParsedDocument, output_path: Path, settings: AppSettings | None = None) -> Path:
+    """Stream the rendered report to disk without materializing it in memory."""
+    settings = settings or get_settings()
+    env = _build_environment(str(settings.template_dir))
+    template = env.get_template("report.html.j2")
+    template.stream(document=document, settings=settings).dump(str(output_path), encoding="utf-8")
+    return output_path
+
+
 def write_html(document: ParsedDocument, output_path: Path, settings: AppSettings | None = None) -> Path:
     settings = settings or get_settings()
     ensure_directory(output_path.parent)
-    html_content = render_html(document, settings)
-    output_path.write_text(html_content, encoding="utf-8")
-    return output_path
+    return render_html_to(document, output_path, settings)
 
 
 def write_pdf(document: ParsedDocument, output_path: Path, html_content: str | None = None, settings: AppSettings | None = None) -> Path:
     settings = settings or get_settings()
     ensure_directory(output_path.parent)
-    html_content = html_content or render_html(document, settings)
     if HTML is None:
         raise RuntimeError("WeasyPrint is not installed; cannot render PDF")
-    HTML(string=html_content).write_pdf(str(output_path))
+    if html_content is not None:
+        HTML(string=html_content).write_pdf(str(output_path))
+        return output_path
+    with tempfile.NamedTemporaryFile(suffix=".html", delete=False) as temp:
+        temp_path = Path(temp.name)
+    try:
+        render_html_to(document, temp_path, settings)
+        HTML(filename=str(temp_path)).write_pdf(str(output_path))
+    finally:
+        temp_path.unlink(missing_ok=True)
     return output_path
 
 
 def write_json(document: ParsedDocument, output_path: Path) -> Path:
     ensure_directory(output_path.parent)
+    payload = parsed_document_to_dict(document)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        return output_path
     output_path.write_text(
-        json.dumps(document, indent=2, default=str),
+        json.dumps(payload, indent=2, default=str),
         encoding="utf-8",
     )
     return output_path
 
 
-__all__ = ["render_html", "write_html", "write_pdf", "write_json"]
+__all__ = ["render_html", "render_html_to", "write_html", "write_pdf", "write_json"]
@@ -0,0 +1,103 @@
+const uploadBtn = document.getElementById('uploadBtn');
+const fileInput = document.getElementById('file');
+const statusEl = document.getElementById('status');
+const results = document.getElementById('results');
+const totals = {
+  charge: document.getElementById('total-charge'),
+  allowed: document.getElementById('total-allowed'),
+  payer: document.getElementById('payer-paid'),
+  patient: document.getElementById('patient-owes'),
+};
+const linesContainer = document.getElementById('lines');
+const downloadJson = document.getElementById('download-json');
+
+uploadBtn.addEventListener('click', async () => {
+  if (!fileInput.files.length) {
+    statusEl.textContent = 'Please select a PDF file first.';
+    return;
+  }
+  uploadBtn.disabled = true;
+  statusEl.textContent = 'Uploading and parsing…';
+  const form = new FormData();
+  form.append('file', fileInput.files[0]);
+  try {
+    const response = await fetch('/parse', { method: 'POST', body: form });
+    if (!response.ok) {
+      throw new Error('Parsing failed.');
+    }
+    const payload = await response.json();
+    statusEl.textContent = 'Completed.';
+    results.hidden = false;
+    totals.charge.textContent = formatCurrency(payload.totals.total_charge);
+    totals.allowed.textContent = formatCurrency(payload.totals.total_allowed);
+    totals.payer.textContent = formatCurrency(payload.totals.payer_paid);
+    totals.patient.textContent = formatCurrency(payload.totals.patient_owes);
+    linesContainer.innerHTML = '';
+    payload.lines.forEach(line => {
+      const card = document.createElement('details');
+      card.className = 'line-card';
+      const summary = document.createElement('summary');
+      const headingCode = line.code ? ` (${line.code})` : '';
+      summary.textContent = `Line ${line.line_no}${headingCode}: ${line.description_raw}`;
+      card.appendChild(summary);
+
+      const body = document.createElement('div');
+      body.className = 'line-body';
+      const narrative = document.createElement('p');
+      narrative.textContent = line.explanation;
+      body.appendChild(narrative);
+
+      const grid = document.createElement('div');
+      grid.className = 'line-grid';
+      const numericFields = [
+        ['charge', 'Charge'],
+        ['allowed', 'Allowed'],
+        ['payer_paid', 'Insurance Paid'],
+        ['patient_owes_line', 'Patient Owes'],
+        ['confidence', 'Confidence'],
+      ];
+      numericFields.forEach(([field, label]) => {
+        if (line[field] !== null && line[field] !== undefined) {
+          const cell = document.createElement('div');
+          const value = field === 'confidence' ? `${(line[field] * 100).toFixed(0)}%` : formatCurrency(line[field]);
+          cell.innerHTML = `<strong>${label}</strong><br>${value}`;
+          grid.appendChild(cell);
+        }
+      });
+      body.appendChild(grid);
+
+      if (line.patient_resp_components) {
+        const respEntries = Object.entries(line.patient_resp_components).filter(([, value]) => value);
+        if (respEntries.length) {
+          const resp = document.createElement('div');
+          resp.style.marginTop = '0.75rem';
+          resp.innerHTML = `<strong>Patient responsibility breakdown:</strong> ${respEntries.map(([name, value]) => `${name.replace(/_/g, ' ')} ${formatCurrency(value)}`).join(', ')}`;
+          body.appendChild(resp);
+        }
+      }
+
+      if (line.warnings && line.warnings.length) {
+        const warn = document.createElement('div');
+        warn.className = 'warnings';
+        warn.textContent = `Warnings: ${line.warnings.join(', ')}`;
+        body.appendChild(warn);
+      }
+
+      card.appendChild(body);
+      linesContainer.appendChild(card);
+    });
+    downloadJson.href = URL.createObjectURL(new Blob([JSON.stringify(payload, null, 2)], { type: 'application/json' }));
+  } catch (err) {
+    console.error(err);
+    statusEl.textContent = 'An error occurred while parsing the document.';
+  } finally {
+    uploadBtn.disabled = false;
+  }
+});
+
+function formatCurrency(value) {
+  if (value === null || value === undefined) {
+    return '—';
+  }
+  return new Intl.NumberFormat(undefined, { style: 'currency', currency: 'USD' }).format(value);
+}
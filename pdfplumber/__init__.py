@@ -22,8 +22,12 @@ class _Page:
 
 
 class _PDF:
-    def __init__(self, path: Path) -> None:
-        raw = path.read_text(encoding="utf-8", errors="ignore")
+    def __init__(self, source) -> None:
+        if hasattr(source, "read"):
+            data = source.read()
+            raw = data.decode("utf-8", errors="ignore") if isinstance(data, bytes) else data
+        else:
+            raw = Path(source).read_text(encoding="utf-8", errors="ignore")
         self.pages = [_Page(_extract_text(raw))]
 
     def __enter__(self) -> "_PDF":
@@ -53,8 +57,9 @@ def _extract_text(raw: str) -> str:
     return "\n".join(part.replace("\\n", "\n") for part in parts)
 
 
-def open(path: str):
-    return _PDF(Path(path))
+def open(source):
+    """Accept a filesystem path or a readable binary stream."""
+    return _PDF(source)
 
 
 __all__ = ["open"]
@@ -1,33 +1,71 @@
+import copy
+import importlib.util
+import io
+import re
+from functools import lru_cache
 from pathlib import Path
 
 import pytest
 
 from app.config import get_settings
-from app.parsing.pipeline import parse_document, parsed_document_to_dict
+from app.parsing.pipeline import parse_document, parse_document_cached, parsed_document_to_dict
 
-FIXTURE_DIR = Path(__file__).parent / "fixtures"
+FIXTURE_DIR = (Path(__file__).parent / "fixtures").resolve()
+DIGITAL_INVOICE_PDF = FIXTURE_DIR / "digital_provider_invoice.pdf"
+NEG_ADJ_PDF = FIXTURE_DIR / "negative_adjustment.pdf"
 
+_PATIENT_RE = re.compile(r"patient", re.IGNORECASE)
 
-def test_parse_digital_provider_invoice(tmp_path):
-    settings = get_settings()
-    pdf = FIXTURE_DIR / "digital_provider_invoice.pdf"
-    document = parse_document(pdf, settings=settings)
-    assert document.totals.total_charge == pytest.approx(350.0)
+#: get_settings() is lru_cached, but binding it once keeps tests uniform.
+SETTINGS = get_settings()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def digital_invoice_bytes():
+    """Warm the OS page cache for the shared fixture and expose its bytes."""
+    return DIGITAL_INVOICE_PDF.read_bytes()
+
+
+@lru_cache(maxsize=8)
+def _cached_parse(path_str, mtime_ns):
+    return parse_document(Path(path_str), settings=SETTINGS)
+
+
+def _parse_fixture(path):
+    """Parse a fixture PDF once per (path, mtime) and hand out private copies."""
+    return copy.deepcopy(_cached_parse(str(path), path.stat().st_mtime_ns))
+
+
+@pytest.fixture(scope="session")
+def parsed_docs():
+    """Pre-parsed fixture documents, computed once and shared read-only."""
+    paths = (DIGITAL_INVOICE_PDF, NEG_ADJ_PDF)
+    return {path.name: _parse_fixture(path) for path in paths}
+
+
+def test_parse_digital_provider_invoice(parsed_docs):
+    document = parsed_docs["digital_provider_invoice.pdf"]
+    assert int(round(document.totals.total_charge * 100)) == 35000
     assert len(document.lines) >= 1
     assert document.doc_type == "eob"
-    for line in document.lines:
-        assert "patient" in line.explanation.lower()
-        assert line.patient_owes_line >= 0
+    assert all(_PATIENT_RE.search(line.explanation) for line in document.lines)
+    assert all(line.patient_owes_line >= 0 for line in document.lines)
     payload = parsed_document_to_dict(document)
     assert payload["totals"]["patient_owes"] >= 0
     assert "patient_resp_components" in payload["lines"][0]
 
 
-def test_negative_adjustment(tmp_path):
-    settings = get_settings()
-    pdf = FIXTURE_DIR / "negative_adjustment.pdf"
-    document = parse_document(pdf, settings=settings)
-    assert any(adj.amount < 0 for line in document.lines for adj in line.adjustments) or document.lines
+def test_negative_adjustment(parsed_docs):
+    document = parsed_docs["negative_adjustment.pdf"]
+    # The old `any(...) or document.lines` masked a missing negative adjustment
+    # behind list truthiness. Require lines unconditionally, and when the
+    # extractor surfaces adjustment rows, short-circuit on the first negative.
+    assert document.lines
+    if any(line.adjustments for line in document.lines):
+        assert next(
+            (True for line in document.lines for adj in line.adjustments if adj.amount < 0),
+            False,
+        )
 
 
 def test_placeholder_when_no_tables(monkeypatch):
@@ -37,7 +75,33 @@ def test_placeholder_when_no_tables(monkeypatch):
         return []
 
     monkeypatch.setattr(pipeline, "iter_tables", empty_tables)
-    settings = get_settings()
-    pdf = FIXTURE_DIR / "digital_provider_invoice.pdf"
-    document = parse_document(pdf, settings=settings)
+    # The assertion only exercises the no-tables placeholder branch, so skip
+    # the real text extraction as well instead of paying for a full parse.
+    monkeypatch.setattr(pipeline, "extract_text", lambda _path: "")
+    document = parse_document(DIGITAL_INVOICE_PDF, settings=SETTINGS)
     assert document.lines[0].warnings
+
+
+def test_parse_document_from_stream(digital_invoice_bytes):
+    # The inline upload path in app.main hands parse_document a BytesIO
+    # instead of a spooled temp file; exercise the same round trip here.
+    document = parse_document(io.BytesIO(digital_invoice_bytes), settings=SETTINGS)
+    assert int(round(document.totals.total_charge * 100)) == 35000
+    assert document.doc_type == "eob"
+
+
+def test_parse_document_cached_reuses_result():
+    first = parse_document_cached(DIGITAL_INVOICE_PDF, settings=SETTINGS)
+    second = parse_document_cached(DIGITAL_INVOICE_PDF, settings=SETTINGS)
+    assert second is first
+    assert int(round(first.totals.total_charge * 100)) == 35000
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("pytest_benchmark") is None,
+    reason="pytest-benchmark is not installed",
+)
+def test_parse_perf(benchmark):
+    """Regression gate on the hot parser path; runs only when the plugin is present."""
+    benchmark(parse_document, DIGITAL_INVOICE_PDF, settings=SETTINGS)
+    assert benchmark.stats.stats.mean < 0.5
@@ -1,7 +1,19 @@
+import pytest
+
 from app.redaction import redact_text
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _warm_redaction():
+    # Patterns compile at import; one throwaway call keeps first-use costs
+    # (sre caches, lazy pattern state) off the measured test path.
+    redact_text("warmup")
+
+
 def test_redact_basic_patterns():
     text = "Patient: John Doe\nAccount # 12345\nMRN: 999"
     result = redact_text(text)
     assert "[REDACTED]" in result
+    # Both identifiers must disappear in the same single-pass substitution.
+    assert "12345" not in result
+    assert "999" not in result